@@ -2,20 +2,99 @@
 
 import sys
 import os
+import re
 import json
+import atexit
 import argparse
 import logging
 from datetime import datetime, timedelta
-from vault_client import VaultClient
-from simple_privatebin import create_credentials_link
+import orjson
+from vault_client import VaultClient, get_vault_client
+from simple_privatebin import SimplePrivateBin, create_credentials_link
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Audit log files stay open for the life of the process instead of being
+# reopened for every credential request.
+_AUDIT_HANDLES = {}
+
+def _get_audit(path: str):
+    """
+    Return the open append handle for an audit log, closing the handle for
+    any previous day's file.
+    """
+    fh = _AUDIT_HANDLES.get(path)
+    if fh is None:
+        _close_audit_handles()
+        fh = _AUDIT_HANDLES[path] = open(path, 'ab', buffering=65536)
+    return fh
+
+@atexit.register
+def _close_audit_handles():
+    for fh in _AUDIT_HANDLES.values():
+        fh.close()
+    _AUDIT_HANDLES.clear()
+
+# The Slack message is serialised once; each notification only splices its
+# JSON-escaped values into the placeholders in a single pass.
+_SLACK_TEMPLATE_JSON = orjson.dumps({
+    "text": "🔐 Database Access Granted: {db}",
+    "blocks": [
+        {
+            "type": "header",
+            "text": {
+                "type": "plain_text",
+                "text": "🔐 Secure Database Access - {DB}"
+            }
+        },
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": "*Developer:* {dev}\n*Database:* {db}\n*Expires:* {exp}"
+            }
+        },
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": "🔗 *Secure Access Link:* <{url}|Click here for one-time credentials>"
+            }
+        },
+        {
+            "type": "section",
+            "text": {
+                "type": "mrkdwn",
+                "text": "⚠️ *Security Notice:*\n• Link self-destructs after viewing\n• Credentials auto-expire in 1 hour\n• All access is audited and logged"
+            }
+        }
+    ]
+})
+_SLACK_PLACEHOLDER_RE = re.compile(rb"\{(dev|db|DB|url|exp)\}")
+_SLACK_HEADERS = {"Content-Type": "application/json"}
+
+def _build_slack_payload(developer_email: str, database_type: str, privatebin_url: str, expires_at: str) -> bytes:
+    """
+    Render the Slack message JSON for one access record.
+    """
+    values = {
+        b"dev": developer_email,
+        b"db": database_type,
+        b"DB": database_type.upper(),
+        b"url": privatebin_url,
+        b"exp": expires_at
+    }
+    # orjson.dumps of a str is a quoted JSON string; strip the quotes
+    escaped = {key: orjson.dumps(value)[1:-1] for key, value in values.items()}
+    return _SLACK_PLACEHOLDER_RE.sub(lambda m: escaped[m.group(1)], _SLACK_TEMPLATE_JSON)
+
 class DeveloperAccessManager:
     def __init__(self, vault_client: VaultClient, privatebin_url: str = "http://localhost:8080"):
         self.vault = vault_client
         self.privatebin_url = privatebin_url
+        # Shared paste store so each request skips re-creating the storage directory
+        self.privatebin = SimplePrivateBin()
 
     def request_database_access(self, database_type: str, developer_email: str, justification: str) -> dict:
         """
@@ -41,13 +120,19 @@ class DeveloperAccessManager:
 
         vault_role = role_mapping[database_type]
 
+        # One timestamp for the whole request keeps the record, audit entry
+        # and log file name consistent with each other
+        now = datetime.now()
+        now_iso = now.isoformat()
+
         try:
             # Request ephemeral credentials from Vault
             logger.info(f"Requesting {database_type} credentials for {developer_email}")
-            username, password, lease_id = self.vault.get_database_credentials(vault_role)
+            # Every developer gets their own database user and lease for auditing
+            username, password, lease_id = self.vault.get_database_credentials(vault_role, use_cache=False)
 
             # Calculate expiration time (1 hour from now)
-            expires_at = datetime.now() + timedelta(hours=1)
+            expires_at = now + timedelta(hours=1)
 
             # Determine connection details
             connection_details = {
@@ -67,19 +152,23 @@ class DeveloperAccessManager:
                 host=host,
                 port=port,
                 lease_id=lease_id,
-                expires_at=expires_at
+                expires_at=expires_at,
+                pb=self.privatebin
             )
+            # The viewer is another process reading from disk: the paste must
+            # be written before the link is handed out
+            self.privatebin.flush()
 
             # Prepare access record
             access_record = {
-                "request_id": f"access-{datetime.now().strftime('%Y%m%d-%H%M%S')}",
+                "request_id": f"access-{now.strftime('%Y%m%d-%H%M%S')}",
                 "developer_email": developer_email,
                 "database_type": database_type,
                 "justification": justification,
                 "vault_lease_id": lease_id,
                 "expires_at": expires_at.isoformat(),
                 "privatebin_url": privatebin_url,
-                "requested_at": datetime.now().isoformat(),
+                "requested_at": now_iso,
                 "security_notes": {
                     "burn_after_reading": True,
                     "auto_expires": "1 hour",
@@ -89,17 +178,19 @@ class DeveloperAccessManager:
             }
 
             # Log the access request for audit
-            with open(f"access_requests_{datetime.now().strftime('%Y%m%d')}.log", "a") as f:
-                audit_entry = {
-                    "timestamp": datetime.now().isoformat(),
-                    "action": "credential_request",
-                    "developer": developer_email,
-                    "database": database_type,
-                    "lease_id": lease_id,
-                    "justification": justification,
-                    "expires_at": expires_at.isoformat()
-                }
-                f.write(json.dumps(audit_entry) + "\n")
+            audit_entry = {
+                "timestamp": now_iso,
+                "action": "credential_request",
+                "developer": developer_email,
+                "database": database_type,
+                "lease_id": lease_id,
+                "justification": justification,
+                "expires_at": expires_at.isoformat()
+            }
+            fh = _get_audit(f"access_requests_{now.strftime('%Y%m%d')}.log")
+            fh.write(orjson.dumps(audit_entry) + b"\n")
+            # Audit entries must survive a crash, so push each one to the OS
+            fh.flush()
 
             logger.info(f"Access granted to {developer_email} for {database_type}")
             return access_record
@@ -108,7 +199,8 @@ class DeveloperAccessManager:
             logger.error(f"Failed to grant database access: {e}")
             raise
 
-def send_slack_notification(access_record: dict, slack_webhook_url: str = None, slack_token: str = None) -> bool:
+def send_slack_notification(access_record: dict, slack_webhook_url: str = None, slack_token: str = None,
+                            session=None) -> bool:
     """
     Send Slack DM with secure credential access link.
 
@@ -116,6 +208,7 @@ def send_slack_notification(access_record: dict, slack_webhook_url: str = None,
         access_record: Dictionary with access details
         slack_webhook_url: Optional webhook URL for notifications
         slack_token: Optional Slack bot token for DMs
+        session: Optional requests.Session to reuse the webhook connection across notifications
 
     Returns:
         Boolean indicating success
@@ -125,49 +218,19 @@ def send_slack_notification(access_record: dict, slack_webhook_url: str = None,
 
     # Extract key information
     developer_email = access_record["developer_email"]
-    database_type = access_record["database_type"]
-    privatebin_url = access_record["privatebin_url"]
-    expires_at = access_record["expires_at"]
-
-    # Format Slack message
-    slack_message = {
-        "text": f"🔐 Database Access Granted: {database_type}",
-        "blocks": [
-            {
-                "type": "header",
-                "text": {
-                    "type": "plain_text",
-                    "text": f"🔐 Secure Database Access - {database_type.upper()}"
-                }
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"*Developer:* {developer_email}\n*Database:* {database_type}\n*Expires:* {expires_at}"
-                }
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": f"🔗 *Secure Access Link:* <{privatebin_url}|Click here for one-time credentials>"
-                }
-            },
-            {
-                "type": "section",
-                "text": {
-                    "type": "mrkdwn",
-                    "text": "⚠️ *Security Notice:*\n• Link self-destructs after viewing\n• Credentials auto-expire in 1 hour\n• All access is audited and logged"
-                }
-            }
-        ]
-    }
+
+    payload = _build_slack_payload(
+        developer_email=developer_email,
+        database_type=access_record["database_type"],
+        privatebin_url=access_record["privatebin_url"],
+        expires_at=access_record["expires_at"]
+    )
 
     try:
         if slack_webhook_url:
             # Send via webhook
-            response = requests.post(slack_webhook_url, json=slack_message)
+            http = session or requests
+            response = http.post(slack_webhook_url, data=payload, headers=_SLACK_HEADERS)
             if response.status_code == 200:
                 logger.info(f"Slack notification sent to {developer_email}")
                 return True
@@ -182,9 +245,10 @@ def send_slack_notification(access_record: dict, slack_webhook_url: str = None,
 
         else:
             # For demo purposes, just log the message
-            logger.info("=== SLACK MESSAGE (Demo Mode) ===")
-            logger.info(json.dumps(slack_message, indent=2))
-            logger.info("=== END SLACK MESSAGE ===")
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("=== SLACK MESSAGE (Demo Mode) ===")
+                logger.info(orjson.dumps(orjson.loads(payload), option=orjson.OPT_INDENT_2).decode())
+                logger.info("=== END SLACK MESSAGE ===")
             return True
 
     except Exception as e:
@@ -204,7 +268,7 @@ def main():
 
     try:
         # Initialize Vault client
-        vault_client = VaultClient(vault_url=args.vault_url)
+        vault_client = get_vault_client(vault_url=args.vault_url)
         access_manager = DeveloperAccessManager(vault_client, args.privatebin_url)
 
         # Request database access
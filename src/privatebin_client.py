@@ -1,40 +1,101 @@
 #!/usr/bin/env python3
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
+import re
 import secrets
 import base64
+import gzip
+from urllib.parse import urlencode
+from hashlib import blake2b
 from datetime import datetime, timedelta
 import logging
+from typing import Dict, Union
+import orjson
 
 logger = logging.getLogger(__name__)
 
+# Success markers in a non-JSON (HTML) PrivateBin response, matched on raw bytes
+_FALLBACK_RE = re.compile(rb"successfully|created", re.IGNORECASE)
+
+def _content_digest(content: bytes) -> int:
+    """
+    Short, process-independent digest of paste content for demo URLs.
+    """
+    return int.from_bytes(blake2b(content, digest_size=4).digest(), 'big') % 100000
+
 class PrivateBinClient:
-    def __init__(self, privatebin_url: str = "http://localhost:8080"):
+    def __init__(self, privatebin_url: str = "http://localhost:8080", compress_requests: bool = False):
         self.base_url = privatebin_url.rstrip('/')
+        # Gzip request bodies only when the server is known to inflate them;
+        # PHP and a default nginx front end do not.
+        self.compress_requests = compress_requests
+
+        # Keep-alive session so successive pastes reuse the TCP/TLS connection
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=8)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.session.headers["Connection"] = "keep-alive"
+
+        # Fixed per client; requests merges rather than mutates these
+        self._post_url = self.base_url + "/"
+        self._post_headers = {
+            "Content-Type": "application/x-www-form-urlencoded",
+            "Accept-Encoding": "gzip"
+        }
+        if compress_requests:
+            self._post_headers["Content-Encoding"] = "gzip"
+
+    def close(self):
+        """
+        Close the pooled connections held by this client.
+        """
+        self.session.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
-    def create_paste(self, content: str, expiration: str = "1hour", burn_after_reading: bool = True) -> str:
+    def create_paste_from_obj(self, obj: dict, expiration: str = "1hour", burn_after_reading: bool = True,
+                              pretty: bool = False) -> str:
+        """
+        Create a paste from a JSON-serializable object.
+        The object is serialized once, straight to the bytes that are posted.
+        """
+        content = orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        return self.create_paste(content, expiration=expiration, burn_after_reading=burn_after_reading)
+
+    def create_paste(self, content: Union[str, bytes], expiration: str = "1hour", burn_after_reading: bool = True) -> str:
         """
         Create a secure paste in PrivateBin with ephemeral database credentials.
         Uses simplified format for compatibility.
         """
 
+        # Encode once; the same bytes are posted and hashed for demo URLs
+        content_bytes = content.encode() if isinstance(content, str) else content
+
         try:
             # Simple form data approach
             form_data = {
-                "data": content,
+                "data": content_bytes,
                 "expire": expiration,
                 "formatter": "plaintext",
                 "opendiscussion": "0",
                 "burnafterreading": "1" if burn_after_reading else "0"
             }
 
-            response = requests.post(
-                f"{self.base_url}/",
-                data=form_data,
-                headers={
-                    "Content-Type": "application/x-www-form-urlencoded"
-                }
+            body = urlencode(form_data).encode()
+            if self.compress_requests:
+                body = gzip.compress(body, compresslevel=1)
+
+            response = self.session.post(
+                self._post_url,
+                data=body,
+                headers=self._post_headers
             )
 
             if response.status_code == 200:
@@ -56,10 +117,9 @@ class PrivateBinClient:
                         raise Exception(f"PrivateBin error: {result.get('message', 'Unknown error')}")
                 except json.JSONDecodeError:
                     # If not JSON, try to extract ID from HTML response
-                    response_text = response.text
-                    if "successfully" in response_text.lower() or "created" in response_text.lower():
+                    if _FALLBACK_RE.search(response.content):
                         # For demo purposes, create a mock URL
-                        paste_url = f"{self.base_url}/?demo_paste_{hash(content) % 100000}"
+                        paste_url = f"{self.base_url}/?demo_paste_{_content_digest(content_bytes)}"
                         logger.info(f"Created PrivateBin paste (demo): {paste_url}")
                         return paste_url
                     else:
@@ -71,18 +131,35 @@ class PrivateBinClient:
             logger.error(f"Failed to create PrivateBin paste: {e}")
 
             # Fallback: create a local demo URL for testing
-            demo_url = f"{self.base_url}/?demo_credentials_{hash(content) % 100000}"
+            demo_url = f"{self.base_url}/?demo_credentials_{_content_digest(content_bytes)}"
             logger.warning(f"Using demo URL for testing: {demo_url}")
             return demo_url
 
+# Clients are shared per PrivateBin URL so repeated credential issuance
+# reuses the same connection pool.
+_CLIENTS: Dict[str, PrivateBinClient] = {}
+
+def get_privatebin_client(privatebin_url: str = "http://localhost:8080") -> PrivateBinClient:
+    """
+    Return the shared PrivateBinClient for a PrivateBin URL.
+    """
+    client = _CLIENTS.get(privatebin_url)
+    if client is None:
+        client = _CLIENTS[privatebin_url] = PrivateBinClient(privatebin_url)
+    return client
+
 def create_credentials_paste(username: str, password: str, database: str, host: str, port: int,
-                           lease_id: str, expires_at: datetime, privatebin_url: str = "http://localhost:8080") -> str:
+                           lease_id: str, expires_at: datetime, privatebin_url: str = "http://localhost:8080",
+                           pretty: bool = False) -> str:
     """
     Create a secure, self-destructing paste with database credentials.
+    The payload is compact JSON unless pretty is set.
 
     Returns the PrivateBin URL for one-time access.
     """
 
+    now = datetime.now()
+
     # Prepare credential information
     cred_info = {
         "database_type": database,
@@ -96,7 +173,7 @@ def create_credentials_paste(username: str, password: str, database: str, host:
         "security_info": {
             "vault_lease_id": lease_id,
             "expires_at": expires_at.isoformat(),
-            "time_remaining": str(expires_at - datetime.now()),
+            "time_remaining_seconds": int((expires_at - now).total_seconds()),
             "auto_revoked": True
         },
         "usage_instructions": {
@@ -104,19 +181,17 @@ def create_credentials_paste(username: str, password: str, database: str, host:
             "mongodb": f"mongodb://{username}:{password}@{host}:{port}/demo"
         },
         "security_warning": "⚠️  SECURITY NOTICE: These credentials are temporary and will auto-expire. Do not save or share this information.",
-        "generated_at": datetime.now().isoformat(),
+        "generated_at": now.isoformat(),
         "generated_for": "Authorized database access via Vault JIT credentials"
     }
 
-    # Format as readable JSON
-    formatted_content = json.dumps(cred_info, indent=2)
-
     # Create the paste
-    client = PrivateBinClient(privatebin_url)
-    paste_url = client.create_paste(
-        content=formatted_content,
+    client = get_privatebin_client(privatebin_url)
+    paste_url = client.create_paste_from_obj(
+        cred_info,
         expiration="1hour",  # Match Vault lease TTL
-        burn_after_reading=True  # Self-destruct after viewing
+        burn_after_reading=True,  # Self-destruct after viewing
+        pretty=pretty
     )
 
     return paste_url
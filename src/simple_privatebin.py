@@ -1,11 +1,64 @@
 #!/usr/bin/env python3
 
-import json
 import base64
-import secrets
+import re
+import bisect
+import fcntl
 import os
+import time
+import queue
+import atexit
+import logging
+import tempfile
+import threading
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
 from datetime import datetime, timedelta
-from typing import Dict, Optional
+from typing import Dict, Optional, Set
+import msgpack
+import orjson
+
+logger = logging.getLogger(__name__)
+
+_b64 = base64.urlsafe_b64encode
+
+# One background writer, shared by every store, persists pastes and the
+# expiry index so creating a paste never waits on disk. Queue entries are
+# (function, args) pairs run in order.
+_WRITE_QUEUE: queue.Queue = queue.Queue()
+_writer: Optional[threading.Thread] = None
+_writer_lock = threading.Lock()
+
+def _write_loop():
+    while True:
+        func, args = _WRITE_QUEUE.get()
+        try:
+            func(*args)
+        except Exception as e:
+            logger.error("Background paste write failed: %s", e)
+        finally:
+            _WRITE_QUEUE.task_done()
+
+def _enqueue_write(func, *args):
+    global _writer
+    if _writer is None:
+        with _writer_lock:
+            if _writer is None:
+                _writer = threading.Thread(target=_write_loop, name="privatebin-writer", daemon=True)
+                _writer.start()
+    _WRITE_QUEUE.put((func, args))
+
+@atexit.register
+def _flush_writes():
+    if _writer is not None:
+        _WRITE_QUEUE.join()
+
+def _atomic_write(path: str, data: bytes):
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
 
 class SimplePrivateBin:
     """
@@ -17,6 +70,155 @@ class SimplePrivateBin:
         self.storage_dir = storage_dir
         os.makedirs(storage_dir, exist_ok=True)
 
+        # Expiry index kept as parallel arrays sorted by expiry time, so a
+        # sweep is one bisect instead of opening every paste file. Several
+        # stores (and processes) share a directory, so the on-disk index is
+        # only ever updated by merging into it under a file lock. The suffixes
+        # differ from paste files so no paste id can address them.
+        self._index_path = os.path.join(storage_dir, "expiry.index")
+        self._index_lock_path = os.path.join(storage_dir, "expiry.index.lock")
+        # Expiries this store knows about, and those not yet merged to disk
+        self._expiry_by_id: Dict[str, float] = {}
+        self._index_pending: Dict[str, float] = {}
+
+        # Pastes whose write is still queued are served from memory and
+        # dropped once on disk, after which the file is the only copy. Pastes
+        # burned or swept while queued are remembered so the writer skips
+        # them, or deletes the file if the burn raced with the write. A paste
+        # whose write failed stays in memory and the failure is raised by the
+        # next flush(). The viewer runs in another process and reads the
+        # files, so call flush() before a link must be viewable.
+        self._mem: Dict[str, Dict] = {}
+        self._burned_queued: Set[str] = set()
+        self._write_errors: list = []
+        self._state_lock = threading.Lock()
+
+    def _persist_paste(self, paste_id: str, data: bytes):
+        with self._state_lock:
+            if paste_id in self._burned_queued:
+                self._burned_queued.discard(paste_id)
+                return  # Burned before its turn: never put it on disk
+
+        paste_file = self._paste_path(paste_id)
+        try:
+            _atomic_write(paste_file, data)
+        except Exception as e:
+            with self._state_lock:
+                self._write_errors.append(e)
+            raise
+
+        with self._state_lock:
+            self._mem.pop(paste_id, None)
+            burned = paste_id in self._burned_queued
+            self._burned_queued.discard(paste_id)
+
+        if burned:
+            try:
+                os.remove(paste_file)
+            except FileNotFoundError:
+                pass
+
+    def flush(self):
+        """
+        Block until every queued paste and index write has reached disk.
+        Raises the first write of this store that failed since the last flush.
+        """
+        _flush_writes()
+
+        with self._state_lock:
+            errors, self._write_errors = self._write_errors, []
+        if errors:
+            raise errors[0]
+
+    def _paste_path(self, paste_id: str) -> str:
+        return os.path.join(self.storage_dir, f"{paste_id}.mpk")
+
+    @contextmanager
+    def _locked_index(self):
+        """
+        Hold the index lock, shared with other stores and processes.
+        """
+        with open(self._index_lock_path, 'ab') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            yield
+
+    def _read_index(self):
+        ids = []
+        expiry = array('d')
+        try:
+            index = msgpack.unpackb(Path(self._index_path).read_bytes(), raw=False)
+            ids = index["ids"]
+            expiry.frombytes(index["expiry"])
+        except FileNotFoundError:
+            pass
+        return ids, expiry
+
+    def _write_index(self, ids: list, expiry: array):
+        _atomic_write(self._index_path, msgpack.packb({"ids": ids, "expiry": expiry.tobytes()}))
+
+    def _discard_paste(self, paste_id: str):
+        with self._state_lock:
+            if self._mem.pop(paste_id, None) is not None:
+                self._burned_queued.add(paste_id)
+            self._expiry_by_id.pop(paste_id, None)
+        try:
+            os.remove(self._paste_path(paste_id))
+        except FileNotFoundError:
+            pass  # Already burned after reading
+
+    def _drop_expired(self, ids: list, expiry: array) -> int:
+        """
+        Delete the expired prefix of an index, in place. Caller holds the lock.
+        """
+        cutoff = bisect.bisect_left(expiry, time.time())
+        for paste_id in ids[:cutoff]:
+            self._discard_paste(paste_id)
+        del ids[:cutoff]
+        del expiry[:cutoff]
+        return cutoff
+
+    def _merge_index(self):
+        with self._state_lock:
+            pending, self._index_pending = self._index_pending, {}
+        if not pending:
+            return  # Already merged by an earlier queued call
+
+        try:
+            with self._locked_index():
+                ids, expiry = self._read_index()
+                for paste_id, expires_at_epoch in pending.items():
+                    position = bisect.bisect(expiry, expires_at_epoch)
+                    expiry.insert(position, expires_at_epoch)
+                    ids.insert(position, paste_id)
+                # Every merge also sweeps, so the index only holds live pastes
+                self._drop_expired(ids, expiry)
+                self._write_index(ids, expiry)
+        except Exception as e:
+            with self._state_lock:
+                pending.update(self._index_pending)
+                self._index_pending = pending
+                self._write_errors.append(e)
+            raise
+
+    def sweep_expired(self) -> int:
+        """
+        Delete every paste whose TTL has passed, including pastes created by
+        other stores on the same directory.
+
+        Returns:
+            Number of expired pastes removed from the index
+        """
+        # Our own queued pastes and index entries must be on disk first
+        self.flush()
+
+        with self._locked_index():
+            ids, expiry = self._read_index()
+            cutoff = self._drop_expired(ids, expiry)
+            if cutoff:
+                self._write_index(ids, expiry)
+
+        return cutoff
+
     def create_secure_paste(self, content: str, ttl_hours: int = 1, burn_after_reading: bool = True) -> str:
         """
         Create a secure, self-destructing paste with credentials.
@@ -25,22 +227,29 @@ class SimplePrivateBin:
             URL to access the paste once
         """
 
-        # Generate random paste ID
-        paste_id = secrets.token_urlsafe(16)
+        # Generate random paste ID: 16 random bytes, 22 unpadded base64url chars
+        paste_id = _b64(os.urandom(16))[:22].decode('ascii')
 
         # Create paste metadata
+        now = datetime.now()
+        expires_at = now + timedelta(hours=ttl_hours)
         paste_data = {
             "content": content,
-            "created_at": datetime.now().isoformat(),
-            "expires_at": (datetime.now() + timedelta(hours=ttl_hours)).isoformat(),
+            "created_at": now.isoformat(),
+            "expires_at": expires_at.isoformat(),
+            # Epoch copy so retrieval compares floats instead of parsing ISO text
+            "expires_at_epoch": expires_at.timestamp(),
             "burn_after_reading": burn_after_reading,
             "accessed": False
         }
 
-        # Store paste
-        paste_file = os.path.join(self.storage_dir, f"{paste_id}.json")
-        with open(paste_file, 'w') as f:
-            json.dump(paste_data, f)
+        # Store paste and its expiry: in memory now, on disk in the background
+        with self._state_lock:
+            self._mem[paste_id] = paste_data
+            self._expiry_by_id[paste_id] = paste_data["expires_at_epoch"]
+            self._index_pending[paste_id] = paste_data["expires_at_epoch"]
+        _enqueue_write(self._persist_paste, paste_id, msgpack.packb(paste_data))
+        _enqueue_write(self._merge_index)
 
         # Return access URL
         return f"http://localhost:8080/view/{paste_id}"
@@ -50,18 +259,39 @@ class SimplePrivateBin:
         Retrieve and potentially destroy a paste.
         """
 
-        paste_file = os.path.join(self.storage_dir, f"{paste_id}.json")
+        paste_file = self._paste_path(paste_id)
 
-        if not os.path.exists(paste_file):
+        # Known-expired ids are rejected without reading the paste file;
+        # the index entry goes with the next merge
+        expires_at_epoch = self._expiry_by_id.get(paste_id)
+        if expires_at_epoch is not None and time.time() > expires_at_epoch:
+            self._discard_paste(paste_id)
             return None
 
+        # A paste still waiting for the writer is served from memory; once
+        # written it is read from disk like any other, so a burn by another
+        # process is seen here too.
+        with self._state_lock:
+            paste_data = self._mem.get(paste_id)
+            if paste_data is not None and paste_data["burn_after_reading"]:
+                del self._mem[paste_id]
+                self._burned_queued.add(paste_id)
+        if paste_data is not None:
+            return {
+                "content": paste_data["content"],
+                "created_at": paste_data["created_at"],
+                "expires_at": paste_data["expires_at"],
+                "burned": paste_data["burn_after_reading"]
+            }
+
         try:
-            with open(paste_file, 'r') as f:
-                paste_data = json.load(f)
+            paste_data = msgpack.unpackb(Path(paste_file).read_bytes(), raw=False)
 
             # Check expiration
-            expires_at = datetime.fromisoformat(paste_data["expires_at"])
-            if datetime.now() > expires_at:
+            expires_at_epoch = paste_data.get("expires_at_epoch")
+            if expires_at_epoch is None:
+                expires_at_epoch = datetime.fromisoformat(paste_data["expires_at"]).timestamp()
+            if time.time() > expires_at_epoch:
                 os.remove(paste_file)  # Expired, remove
                 return None
 
@@ -70,15 +300,14 @@ class SimplePrivateBin:
                 os.remove(paste_file)  # Already burned
                 return None
 
-            # Mark as accessed
+            # Burn after reading: delete straight away, there is no point
+            # persisting an "accessed" flag on a file that is about to go
             if paste_data["burn_after_reading"]:
-                paste_data["accessed"] = True
-                if os.path.exists(paste_file):  # Double-check before writing
-                    with open(paste_file, 'w') as f:
-                        json.dump(paste_data, f)
-
-                    # If burn after reading, delete immediately after marking
+                try:
                     os.remove(paste_file)
+                except FileNotFoundError:
+                    # Another reader burned it first
+                    return None
 
             return {
                 "content": paste_data["content"],
@@ -87,60 +316,120 @@ class SimplePrivateBin:
                 "burned": paste_data["burn_after_reading"]
             }
 
+        except FileNotFoundError:
+            # Never created, or removed by another reader
+            return None
+
         except Exception as e:
             # If any error, remove the file for security
-            if os.path.exists(paste_file):
+            try:
                 os.remove(paste_file)
+            except FileNotFoundError:
+                pass
             return None
 
+# Credential paste layout, serialized once at import. Variable fields are
+# $name placeholders; "$port_number" is unquoted afterwards so the port stays
+# a JSON number.
+_CREDENTIALS_SKELETON = {
+    "🔐 Database Access Credentials": {
+        "database_type": "$database_type",
+        "connection_info": {
+            "host": "$host",
+            "port": "$port_number",
+            "database": "demo",
+            "username": "$username",
+            "password": "$password"
+        },
+        "security_info": {
+            "vault_lease_id": "$lease_id",
+            "expires_at": "$expires_at",
+            "time_remaining": "$time_remaining",
+            "auto_revoked": "Yes - Vault will automatically remove this user"
+        },
+        "connection_examples": {
+            "mysql": "mysql -h $host -P $port -u $username -p'$password' demo",
+            "mongodb": "mongodb://$username:$password@$host:$port/demo"
+        },
+        "⚠️ SECURITY WARNINGS": [
+            "These credentials are TEMPORARY and will expire automatically",
+            "This link will self-destruct after you view it",
+            "Do NOT save or share these credentials",
+            "All database access is logged and audited",
+            "Report any suspicious activity immediately"
+        ]
+    }
+}
+
+def _split_template(text: str):
+    """
+    Split a $name template into its literal segments and field names, so
+    filling it is a single join with no placeholder scanning per call.
+    """
+    parts = re.split(r"\$(\w+)", text)
+    return parts[0::2], parts[1::2]
+
+_CREDENTIALS_TEMPLATES = {
+    pretty: _split_template(
+        orjson.dumps(_CREDENTIALS_SKELETON, option=orjson.OPT_INDENT_2 if pretty else 0)
+        .decode()
+        .replace('"$port_number"', '$port_number')
+    )
+    for pretty in (False, True)
+}
+
+def _json_str(value: str) -> str:
+    """
+    Escape a value for splicing inside a JSON string literal.
+    """
+    return orjson.dumps(value).decode()[1:-1]
+
 def create_credentials_link(username: str, password: str, database: str, host: str, port: int,
-                          lease_id: str, expires_at: datetime) -> str:
+                          lease_id: str, expires_at: datetime, pb: SimplePrivateBin = None,
+                          pretty: bool = True) -> str:
     """
     Create a secure link for database credentials using simple PrivateBin.
+    Pass pb to reuse one paste store across many links. The credential viewer
+    shows the paste to a person as-is, so it is indented unless pretty is
+    turned off.
     """
 
-    # Format credentials nicely
-    credentials = {
-        "🔐 Database Access Credentials": {
-            "database_type": database.upper(),
-            "connection_info": {
-                "host": host,
-                "port": port,
-                "database": "demo",
-                "username": username,
-                "password": password
-            },
-            "security_info": {
-                "vault_lease_id": lease_id,
-                "expires_at": expires_at.strftime("%Y-%m-%d %H:%M:%S UTC"),
-                "time_remaining": str(expires_at - datetime.now()).split('.')[0],
-                "auto_revoked": "Yes - Vault will automatically remove this user"
-            },
-            "connection_examples": {
-                "mysql": f"mysql -h {host} -P {port} -u {username} -p'{password}' demo",
-                "mongodb": f"mongodb://{username}:{password}@{host}:{port}/demo"
-            },
-            "⚠️ SECURITY WARNINGS": [
-                "These credentials are TEMPORARY and will expire automatically",
-                "This link will self-destruct after you view it",
-                "Do NOT save or share these credentials",
-                "All database access is logged and audited",
-                "Report any suspicious activity immediately"
-            ]
-        }
-    }
+    now = datetime.now()
+    remaining = max(0, int((expires_at - now).total_seconds()))
 
-    # Create formatted content
-    content = json.dumps(credentials, indent=2)
+    # Only the variable fields are serialized per call
+    literals, fields = _CREDENTIALS_TEMPLATES[pretty]
+    values = {
+        "database_type": _json_str(database.upper()),
+        "host": _json_str(host),
+        "port": _json_str(str(port)),
+        "port_number": str(int(port)),
+        "username": _json_str(username),
+        "password": _json_str(password),
+        "lease_id": _json_str(lease_id),
+        "expires_at": _json_str(expires_at.strftime("%Y-%m-%d %H:%M:%S UTC")),
+        "time_remaining": f"{remaining // 3600}h{(remaining % 3600) // 60}m"
+    }
+    segments = [literals[0]]
+    for name, literal in zip(fields, literals[1:]):
+        segments.append(values[name])
+        segments.append(literal)
+    content = "".join(segments)
 
     # Create secure paste
-    pb = SimplePrivateBin()
+    owns_pb = pb is None
+    pb = pb or SimplePrivateBin()
     secure_url = pb.create_secure_paste(
         content=content,
         ttl_hours=1,
         burn_after_reading=True
     )
 
+    # A throwaway instance must not take its only copy down with it;
+    # shared instances flush in the background and at exit
+    if owns_pb:
+        pb.flush()
+
     return secure_url
 
 if __name__ == "__main__":
@@ -1,7 +1,12 @@
 import hvac
 import os
+import time
 import logging
-from typing import Dict, Optional, Tuple
+import threading
+import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from typing import Dict, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -9,35 +14,121 @@ class VaultClient:
     def __init__(self, vault_url: str = "http://localhost:8200", token: str = None):
         self.vault_url = vault_url
         self.token = token or os.getenv("VAULT_TOKEN", "root-token")
-        self.client = hvac.Client(url=vault_url, token=self.token)
-
+        # One keep-alive session shared by every thread using this client
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        self.client = hvac.Client(url=vault_url, token=self.token, session=self.session)
+        self._lock = threading.Lock()
+        self._role_locks: Dict[str, threading.Lock] = {}
+        # role_name -> ((username, password, lease_id), expires_at, lease_duration)
+        self._cred_cache: Dict[str, Tuple[Tuple[str, str, str], float, int]] = {}
+        # Authentication is checked on the first real Vault call, not here
+        self._authed = False
+        self._engines_enabled: Set[str] = set()
+
+    def _ensure_authenticated(self):
+        if self._authed:
+            return
         if not self.client.is_authenticated():
             raise Exception("Failed to authenticate with Vault")
+        self._authed = True
+
+    def _ensure_secrets_engine(self, backend_type: str, path: str = None):
+        """
+        Enable a secrets engine unless it is already mounted.
+        """
+        path = path or backend_type
+        if path in self._engines_enabled:
+            return
+
+        mounted = self.client.sys.list_mounted_secrets_engines()
+        if f"{path}/" not in mounted.get('data', mounted):
+            self.client.sys.enable_secrets_engine(backend_type=backend_type, path=path)
+        self._engines_enabled.add(path)
 
-    def get_database_credentials(self, role_name: str) -> Tuple[str, str, str]:
+    def get_database_credentials(self, role_name: str, use_cache: bool = True) -> Tuple[str, str, str]:
         """
         Request ephemeral database credentials from Vault.
+        Credentials are reused until 90% of their lease has elapsed unless
+        use_cache is False.
         Returns: (username, password, lease_id)
         """
+        if not use_cache:
+            return self._generate_credentials(role_name)[0]
+
+        # Concurrent callers for one role share a single credential, while
+        # different roles are fetched in parallel
+        with self._role_lock(role_name):
+            with self._lock:
+                cached = self._cred_cache.get(role_name)
+            if cached:
+                credentials, expires_at, lease_duration = cached
+                if time.monotonic() < expires_at - 0.1 * lease_duration:
+                    return credentials
+
+            credentials, lease_duration = self._generate_credentials(role_name)
+            with self._lock:
+                self._cred_cache[role_name] = (credentials, time.monotonic() + lease_duration, lease_duration)
+            return credentials
+
+    def get_database_credentials_batch(self, role_names: List[str], max_workers: int = 8,
+                                       use_cache: bool = True) -> List[Tuple[str, str, str]]:
+        """
+        Request credentials for several roles concurrently over the shared
+        connection pool. With use_cache False every entry, including repeated
+        role names, gets its own user and lease.
+        Returns: list of (username, password, lease_id) in role_names order
+        """
+        if not role_names:
+            return []
+
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(role_names))) as pool:
+            return list(pool.map(
+                lambda role_name: self.get_database_credentials(role_name, use_cache=use_cache),
+                role_names
+            ))
+
+    def _role_lock(self, role_name: str) -> threading.Lock:
+        with self._lock:
+            return self._role_locks.setdefault(role_name, threading.Lock())
+
+    def _generate_credentials(self, role_name: str) -> Tuple[Tuple[str, str, str], int]:
         try:
+            self._ensure_authenticated()
             response = self.client.secrets.database.generate_credentials(name=role_name)
 
             username = response['data']['username']
             password = response['data']['password']
             lease_id = response['lease_id']
+            lease_duration = response.get('lease_duration', 0)
 
             logger.info(f"Generated credentials for role {role_name}, lease_id: {lease_id}")
-            return username, password, lease_id
+            return (username, password, lease_id), lease_duration
 
         except Exception as e:
             logger.error(f"Failed to get credentials for role {role_name}: {e}")
             raise
 
+    def invalidate(self, role_name: str):
+        """
+        Drop cached credentials for a role, e.g. after they were rejected.
+        """
+        with self._lock:
+            self._cred_cache.pop(role_name, None)
+
     def revoke_lease(self, lease_id: str) -> bool:
         """
         Revoke a Vault lease to clean up ephemeral credentials.
         """
+        with self._lock:
+            for role_name, (credentials, _, _) in list(self._cred_cache.items()):
+                if credentials[2] == lease_id:
+                    del self._cred_cache[role_name]
+
         try:
+            self._ensure_authenticated()
             self.client.sys.revoke_lease(lease_id=lease_id)
             logger.info(f"Successfully revoked lease: {lease_id}")
             return True
@@ -50,8 +141,10 @@ class VaultClient:
         Configure MySQL database connection in Vault.
         """
         try:
+            self._ensure_authenticated()
+
             # Enable database secrets engine if not already enabled
-            self.client.sys.enable_secrets_engine(backend_type='database')
+            self._ensure_secrets_engine('database')
 
             # Configure MySQL connection
             self.client.secrets.database.configure(
@@ -86,6 +179,8 @@ class VaultClient:
         Configure MongoDB database connection in Vault.
         """
         try:
+            self._ensure_authenticated()
+
             # Configure MongoDB connection
             self.client.secrets.database.configure(
                 name='mongodb-database',
@@ -111,4 +206,24 @@ class VaultClient:
 
         except Exception as e:
             logger.error(f"Failed to configure MongoDB database: {e}")
-            raise
\ No newline at end of file
+            raise
+
+# Process-wide client so callers share one authenticated session and
+# credential cache instead of building a new hvac.Client each time.
+_client_singleton: Optional[VaultClient] = None
+_client_lock = threading.Lock()
+
+def get_vault_client(vault_url: str = "http://localhost:8200", token: str = None) -> VaultClient:
+    """
+    Return the shared VaultClient, creating it on first use.
+    A different vault_url or token replaces the shared client.
+    """
+    global _client_singleton
+    client = _client_singleton
+    if client is None or client.vault_url != vault_url or (token and client.token != token):
+        with _client_lock:
+            client = _client_singleton
+            if client is None or client.vault_url != vault_url or (token and client.token != token):
+                client = VaultClient(vault_url=vault_url, token=token)
+                _client_singleton = client
+    return client
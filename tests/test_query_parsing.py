@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import os
+import tempfile
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from request_creds_and_run import iter_sql_statements
+
+class TestQueryParsing(unittest.TestCase):
+    def parse(self, sql: str) -> list:
+        with tempfile.NamedTemporaryFile('w', suffix='.sql', delete=False) as f:
+            f.write(sql)
+        self.addCleanup(os.remove, f.name)
+        return list(iter_sql_statements(f.name))
+
+    def test_splits_on_semicolons(self):
+        """Test that statements are split and trailing semicolons removed"""
+        self.assertEqual(
+            self.parse("SELECT 1;\nSELECT 2;\n"),
+            ["SELECT 1", "SELECT 2"]
+        )
+
+    def test_last_statement_without_semicolon(self):
+        """Test that a final statement without a semicolon is kept"""
+        self.assertEqual(self.parse("SELECT 1;\nSELECT 2"), ["SELECT 1", "SELECT 2"])
+
+    def test_semicolons_inside_strings(self):
+        """Test that quoted semicolons do not split statements"""
+        self.assertEqual(
+            self.parse("INSERT INTO t VALUES ('a;b', \"c;d\");\nSELECT 'it\\'s;';"),
+            ["INSERT INTO t VALUES ('a;b', \"c;d\")", "SELECT 'it\\'s;'"]
+        )
+
+    def test_comments_are_skipped(self):
+        """Test that leading comments, including quotes and semicolons, are dropped"""
+        self.assertEqual(
+            self.parse("-- Update a user's email; carefully\nUPDATE t SET a = 1;\n/* done; */\n# trailing\n"),
+            ["UPDATE t SET a = 1"]
+        )
+
+    def test_double_dash_without_space_is_not_a_comment(self):
+        """Test that '--' followed by a non-space character is an operator"""
+        self.assertEqual(
+            self.parse("SELECT 5--3; SELECT 1;\n-- a real comment; here\nSELECT 2;"),
+            ["SELECT 5--3", "SELECT 1", "SELECT 2"]
+        )
+
+    def test_empty_file(self):
+        """Test that an empty file yields no statements"""
+        self.assertEqual(self.parse(""), [])
+
+if __name__ == '__main__':
+    unittest.main()
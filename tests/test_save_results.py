@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import os
+import tempfile
+from decimal import Decimal
+from datetime import datetime
+
+import orjson
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from request_creds_and_run import DatabaseQueryExecutor, SpooledRows
+
+class TestSaveResults(unittest.TestCase):
+    def setUp(self):
+        self.spool = tempfile.TemporaryFile()
+        self.addCleanup(self.spool.close)
+        self.executor = DatabaseQueryExecutor(vault_client=None)
+
+    def save(self, results: dict) -> bytes:
+        with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+            output_file = f.name
+        self.addCleanup(os.remove, output_file)
+        self.executor.save_results(results, output_file)
+        with open(output_file, 'rb') as f:
+            return f.read()
+
+    def test_spooled_rows_match_in_memory_output(self):
+        """Test that spooled rows produce the same file as rows held in memory"""
+        users = [
+            {"id": i, "email": f"user{i}@example.com", "bio": "line one\nline two \"quoted\""}
+            for i in range(5)
+        ]
+        totals = [{"total": Decimal("12.50"), "at": datetime(2024, 1, 2, 3, 4, 5)}]
+
+        def results(first, second, empty):
+            return {
+                'database': 'mysql',
+                'timestamp': '2024-01-02T03:04:05',
+                'lease_id': 'database/creds/mysql-role/1',
+                'queries': [
+                    {'query_index': 0, 'query': 'SELECT * FROM users', 'status': 'success',
+                     'rows_affected': 5, 'data': first},
+                    {'query_index': 1, 'query': 'UPDATE users SET a = 1', 'status': 'success',
+                     'rows_affected': 5, 'data': []},
+                    {'query_index': 2, 'query': 'SELECT total', 'status': 'success',
+                     'rows_affected': 1, 'data': second},
+                    {'query_index': 3, 'query': 'SELECT * FROM empty', 'status': 'success',
+                     'rows_affected': 0, 'data': empty}
+                ]
+            }
+
+        spooled_users = SpooledRows(self.spool)
+        spooled_users.extend(users[:2])
+        spooled_users.extend(users[2:])
+        spooled_totals = SpooledRows(self.spool)
+        spooled_totals.extend(totals)
+        spooled_empty = SpooledRows(self.spool)
+
+        expected = orjson.dumps(results(users, totals, []), option=orjson.OPT_INDENT_2, default=str)
+        self.assertEqual(self.save(results(spooled_users, spooled_totals, spooled_empty)), expected)
+        self.assertEqual(len(spooled_users), 5)
+
+    def test_results_without_spooled_rows(self):
+        """Test that in-memory results (e.g. MongoDB) are written unchanged"""
+        results = {'database': 'mongodb', 'queries': [{'status': 'success', 'data': [{'a': 1}]}]}
+        self.assertEqual(self.save(results), orjson.dumps(results, option=orjson.OPT_INDENT_2))
+
+if __name__ == '__main__':
+    unittest.main()
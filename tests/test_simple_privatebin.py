@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import os
+import tempfile
+import shutil
+import threading
+import json
+import time
+from unittest import mock
+from datetime import datetime, timedelta
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+import simple_privatebin
+from simple_privatebin import SimplePrivateBin, create_credentials_link
+
+class TestSimplePrivateBin(unittest.TestCase):
+    def setUp(self):
+        self.storage_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.storage_dir)
+        self.pb = SimplePrivateBin(self.storage_dir)
+
+    def create(self, content: str = "secret", burn_after_reading: bool = True) -> str:
+        url = self.pb.create_secure_paste(content, burn_after_reading=burn_after_reading)
+        return url.rsplit('/', 1)[-1]
+
+    def test_burn_after_reading_from_memory(self):
+        """Test that a paste is served once from memory and then gone"""
+        paste_id = self.create()
+        self.assertEqual(self.pb.retrieve_paste(paste_id)["content"], "secret")
+        self.assertIsNone(self.pb.retrieve_paste(paste_id))
+
+        self.pb.flush()
+        self.assertFalse(os.path.exists(self.pb._paste_path(paste_id)))
+
+    def test_flush_persists_for_other_instances(self):
+        """Test that a flushed paste can be read by a separate instance"""
+        paste_id = self.create()
+        self.pb.flush()
+
+        reader = SimplePrivateBin(self.storage_dir)
+        retrieved = reader.retrieve_paste(paste_id)
+        self.assertEqual(retrieved["content"], "secret")
+        self.assertTrue(retrieved["burned"])
+        self.assertIsNone(SimplePrivateBin(self.storage_dir).retrieve_paste(paste_id))
+
+    def test_burn_in_another_instance(self):
+        """Test that a paste burned by another instance is not served again"""
+        paste_id = self.create()
+        self.pb.flush()
+
+        self.assertEqual(SimplePrivateBin(self.storage_dir).retrieve_paste(paste_id)["content"], "secret")
+        self.assertIsNone(self.pb.retrieve_paste(paste_id))
+
+    def test_burned_while_queued_never_written(self):
+        """Test that a paste burned before its write never reaches disk"""
+        gate = threading.Event()
+        simple_privatebin._enqueue_write(gate.wait)
+        with mock.patch("simple_privatebin._atomic_write", wraps=simple_privatebin._atomic_write) as write:
+            paste_id = self.create()
+            self.assertEqual(self.pb.retrieve_paste(paste_id)["content"], "secret")
+            gate.set()
+            self.pb.flush()
+
+        written = [call.args[0] for call in write.call_args_list]
+        self.assertNotIn(self.pb._paste_path(paste_id), written)
+        self.assertFalse(os.path.exists(self.pb._paste_path(paste_id)))
+
+    def test_failed_write_is_raised_by_flush(self):
+        """Test that a failed background write is reported and the paste kept"""
+        with mock.patch("simple_privatebin._atomic_write", side_effect=OSError("disk full")):
+            paste_id = self.create()
+            with self.assertRaises(OSError):
+                self.pb.flush()
+
+        self.pb.flush()  # Reported once
+        self.assertEqual(self.pb.retrieve_paste(paste_id)["content"], "secret")
+
+    def test_memory_released_once_written(self):
+        """Test that pastes are only held in memory until they reach disk"""
+        self.create()
+        self.create(burn_after_reading=False)
+        self.pb.flush()
+        self.assertEqual(self.pb._mem, {})
+
+    def test_throwaway_stores_share_one_writer(self):
+        """Test that creating links with throwaway stores does not leak threads"""
+        cwd = os.getcwd()
+        os.chdir(self.storage_dir)
+        self.addCleanup(os.chdir, cwd)
+
+        expires_at = datetime.now() + timedelta(hours=1)
+        create_credentials_link("u", "p", "mysql", "localhost", 3306, "lease", expires_at)
+        threads = threading.active_count()
+        for _ in range(5):
+            create_credentials_link("u", "p", "mysql", "localhost", 3306, "lease", expires_at)
+        self.assertEqual(threading.active_count(), threads)
+
+    def test_index_drops_expired_from_every_store(self):
+        """Test that index merges delete expired pastes created by other stores"""
+        other = SimplePrivateBin(self.storage_dir)
+        expired = [
+            self.pb.create_secure_paste("old", ttl_hours=-1).rsplit('/', 1)[-1],
+            other.create_secure_paste("old", ttl_hours=-1).rsplit('/', 1)[-1]
+        ]
+        live_id = other.create_secure_paste("new").rsplit('/', 1)[-1]
+        other.flush()
+
+        for paste_id in expired:
+            self.assertFalse(os.path.exists(self.pb._paste_path(paste_id)))
+        self.assertEqual(self.pb._read_index()[0], [live_id])
+        self.assertEqual(self.pb.retrieve_paste(live_id)["content"], "new")
+
+    def test_sweep_covers_every_store(self):
+        """Test that sweeping removes pastes from every store once they expire"""
+        paste_ids = [self.create(), SimplePrivateBin(self.storage_dir).create_secure_paste("x").rsplit('/', 1)[-1]]
+        self.pb.flush()
+
+        with mock.patch("simple_privatebin.time.time", return_value=time.time() + 7200):
+            self.assertEqual(SimplePrivateBin(self.storage_dir).sweep_expired(), 2)
+        for paste_id in paste_ids:
+            self.assertFalse(os.path.exists(self.pb._paste_path(paste_id)))
+        self.assertEqual(self.pb._read_index()[0], [])
+
+    def test_paste_without_burn_is_kept(self):
+        """Test that a paste without burn_after_reading survives reads"""
+        paste_id = self.create(burn_after_reading=False)
+        self.assertFalse(self.pb.retrieve_paste(paste_id)["burned"])
+        self.assertEqual(self.pb.retrieve_paste(paste_id)["content"], "secret")
+
+    def test_unknown_paste(self):
+        """Test that an unknown paste id returns None"""
+        self.assertIsNone(self.pb.retrieve_paste("does-not-exist"))
+
+class TestCredentialsTemplate(unittest.TestCase):
+    """The credential paste is spliced from a precomputed template; it must
+    decode to the same structure the dict-built version produced."""
+
+    def setUp(self):
+        self.storage_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.storage_dir)
+        self.pb = SimplePrivateBin(self.storage_dir)
+
+    def expected(self, username, password, database, host, port, lease_id, expires_at, time_remaining):
+        return {
+            "🔐 Database Access Credentials": {
+                "database_type": database.upper(),
+                "connection_info": {
+                    "host": host,
+                    "port": port,
+                    "database": "demo",
+                    "username": username,
+                    "password": password
+                },
+                "security_info": {
+                    "vault_lease_id": lease_id,
+                    "expires_at": expires_at.strftime("%Y-%m-%d %H:%M:%S UTC"),
+                    "time_remaining": time_remaining,
+                    "auto_revoked": "Yes - Vault will automatically remove this user"
+                },
+                "connection_examples": {
+                    "mysql": f"mysql -h {host} -P {port} -u {username} -p'{password}' demo",
+                    "mongodb": f"mongodb://{username}:{password}@{host}:{port}/demo"
+                },
+                "⚠️ SECURITY WARNINGS": [
+                    "These credentials are TEMPORARY and will expire automatically",
+                    "This link will self-destruct after you view it",
+                    "Do NOT save or share these credentials",
+                    "All database access is logged and audited",
+                    "Report any suspicious activity immediately"
+                ]
+            }
+        }
+
+    def test_hostile_values_round_trip(self):
+        """Test that quotes, backslashes, $ and newlines survive in both layouts"""
+        values = {
+            "username": "u$host\"",
+            "password": "p'\"\\$password ${port}\n\t\u2028}{",
+            "database": "mysql",
+            "host": "h\\\"x",
+            "port": 3306,
+            "lease_id": "database/creds/mysql-role/\"$lease_id\"",
+            "expires_at": datetime.now() + timedelta(hours=1)
+        }
+
+        for pretty in (False, True):
+            with self.subTest(pretty=pretty):
+                url = create_credentials_link(**values, pb=self.pb, pretty=pretty)
+                content = self.pb.retrieve_paste(url.rsplit('/', 1)[-1])["content"]
+
+                decoded = json.loads(content)
+                time_remaining = decoded["🔐 Database Access Credentials"]["security_info"]["time_remaining"]
+                self.assertRegex(time_remaining, r"^\d+h\d+m$")
+
+                expected = self.expected(**values, time_remaining=time_remaining)
+                self.assertEqual(decoded, expected)
+                if pretty:
+                    self.assertEqual(content, json.dumps(expected, indent=2, ensure_ascii=False))
+                else:
+                    self.assertEqual(content, json.dumps(expected, separators=(',', ':'), ensure_ascii=False))
+
+if __name__ == '__main__':
+    unittest.main()
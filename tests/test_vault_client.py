@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+
+import unittest
+import sys
+import os
+import itertools
+from unittest import mock
+
+# Add src to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from vault_client import VaultClient
+
+class TestCredentialCache(unittest.TestCase):
+    """Credential caching against a stubbed hvac client; no Vault needed."""
+
+    def setUp(self):
+        self.vault_client = VaultClient()
+        self.vault_client.client = mock.Mock()
+        self.vault_client.client.is_authenticated.return_value = True
+
+        counter = itertools.count(1)
+
+        def generate_credentials(name):
+            n = next(counter)
+            return {
+                "data": {"username": f"{name}-user-{n}", "password": f"pw-{n}"},
+                "lease_id": f"database/creds/{name}/{n}",
+                "lease_duration": 100
+            }
+
+        self.generate = self.vault_client.client.secrets.database.generate_credentials
+        self.generate.side_effect = generate_credentials
+
+        patcher = mock.patch("vault_client.time.monotonic", return_value=1000.0)
+        self.monotonic = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_reuses_cached_credentials(self):
+        """Test that a second request within the lease reuses the credential"""
+        first = self.vault_client.get_database_credentials("mysql-role")
+        self.monotonic.return_value = 1089.0
+        self.assertEqual(self.vault_client.get_database_credentials("mysql-role"), first)
+        self.assertEqual(self.generate.call_count, 1)
+
+    def test_refreshes_after_ninety_percent_of_lease(self):
+        """Test that credentials are replaced once 90% of the lease has elapsed"""
+        first = self.vault_client.get_database_credentials("mysql-role")
+        self.monotonic.return_value = 1090.0
+        second = self.vault_client.get_database_credentials("mysql-role")
+        self.assertNotEqual(second, first)
+        self.assertEqual(self.generate.call_count, 2)
+
+    def test_use_cache_false_bypasses_cache(self):
+        """Test that use_cache=False always mints a new user and leaves the cache alone"""
+        cached = self.vault_client.get_database_credentials("mysql-role")
+        fresh = [self.vault_client.get_database_credentials("mysql-role", use_cache=False) for _ in range(2)]
+        self.assertEqual(len({cached, *fresh}), 3)
+        self.assertEqual(self.vault_client.get_database_credentials("mysql-role"), cached)
+
+    def test_roles_are_cached_separately(self):
+        """Test that each role has its own cached credential"""
+        mysql = self.vault_client.get_database_credentials("mysql-role")
+        mongodb = self.vault_client.get_database_credentials("mongodb-role")
+        self.assertNotEqual(mysql, mongodb)
+        self.assertEqual(self.vault_client.get_database_credentials("mysql-role"), mysql)
+
+    def test_revoke_lease_evicts_cached_credentials(self):
+        """Test that revoking a cached lease forces a new credential"""
+        first = self.vault_client.get_database_credentials("mysql-role")
+        self.assertTrue(self.vault_client.revoke_lease(first[2]))
+        self.vault_client.client.sys.revoke_lease.assert_called_once_with(lease_id=first[2])
+
+        second = self.vault_client.get_database_credentials("mysql-role")
+        self.assertNotEqual(second, first)
+        self.assertEqual(self.generate.call_count, 2)
+
+if __name__ == '__main__':
+    unittest.main()
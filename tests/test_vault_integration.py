@@ -7,11 +7,11 @@ import os
 # Add src to path
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
 
-from vault_client import VaultClient
+from vault_client import get_vault_client
 
 class TestVaultIntegration(unittest.TestCase):
     def setUp(self):
-        self.vault_client = VaultClient()
+        self.vault_client = get_vault_client()
 
     def test_vault_connection(self):
         """Test that we can connect to Vault"""